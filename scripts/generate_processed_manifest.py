@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """Generate manifests pairing processed outputs with enhancement files."""
 import csv
+import heapq
+import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
 from difflib import SequenceMatcher
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 
 # --- Repo & I/O ---
@@ -15,94 +20,182 @@ REPO = Path.cwd()
 MAIN_DIR = REPO / "results" / "new_output"
 ENH_DIR = REPO / "output"
 OUT_DIR = REPO / "manifests"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+STAT_WORKERS = 16  # overlap stat() latency on cold or networked filesystems
+WRITE_BUFFER = 1 << 20  # 1 MiB output buffer: far fewer write() syscalls on large manifests
 
 # --- Matching config ---
 SIM_THRESHOLD = 0.72  # fuzzy name similarity floor
 SIZE_TOLERANCE = 0.08  # ±8% size tolerance considered "close"
-PREF_EXT = {
-    # prefer matching these extension pairs
-    ".png": [".png", ".jpg", ".jpeg", ".tif", ".tiff", ".exr"],
-    ".jpg": [".jpg", ".jpeg", ".png", ".tif", ".tiff"],
-    ".jpeg": [".jpeg", ".jpg", ".png", ".tif", ".tiff"],
-    ".tif": [".tif", ".tiff", ".png", ".jpg", ".jpeg"],
-    ".tiff": [".tiff", ".tif", ".png", ".jpg", ".jpeg"],
-    ".exr": [".exr", ".tif", ".tiff", ".png"],
+FALLBACK_SIM_FLOOR = SIM_THRESHOLD - 0.08  # near-threshold names still considered for review
+PREF_EXT: Dict[str, FrozenSet[str]] = {
+    # prefer matching these extension pairs (frozensets: one hash lookup per check)
+    ".png": frozenset({".png", ".jpg", ".jpeg", ".tif", ".tiff", ".exr"}),
+    ".jpg": frozenset({".jpg", ".jpeg", ".png", ".tif", ".tiff"}),
+    ".jpeg": frozenset({".jpeg", ".jpg", ".png", ".tif", ".tiff"}),
+    ".tif": frozenset({".tif", ".tiff", ".png", ".jpg", ".jpeg"}),
+    ".tiff": frozenset({".tiff", ".tif", ".png", ".jpg", ".jpeg"}),
+    ".exr": frozenset({".exr", ".tif", ".tiff", ".png"}),
 }
 # Common noise tokens to strip from stems when normalizing
 NOISE_PAT = re.compile(
-    r"(?:_processed\\b|_denoise\\b|_sharpen\\b|_v\\d+\\b|_[0-9]{3,4}p\\b|_[0-9]{2,4}(?:bit|b)?\\b|"
-    r"_[0-9]{1,3}fps\\b|_[0-9]+x[0-9]+\\b|_[0-9]{4}-[0-9]{2}-[0-9]{2}\\b|_[0-9]{6,}\\b|_pass\\d+\\b|"
-    r"_final\\b|_draft\\b)",
+    r"(?:_processed\b|_denoise\b|_sharpen\b|_v\d+\b|_[0-9]{3,4}p\b|_[0-9]{2,4}(?:bit|b)?\b|"
+    r"_[0-9]{1,3}fps\b|_[0-9]+x[0-9]+\b|_[0-9]{4}-[0-9]{2}-[0-9]{2}\b|_[0-9]{6,}\b|_pass\d+\b|"
+    r"_final\b|_draft\b)",
     re.IGNORECASE,
 )
+# Underscores and dashes become spaces so str.split() collapses every separator run
+SEPARATOR_TABLE = str.maketrans("_-", "  ")
 
 
+@lru_cache(maxsize=None)
 def norm_stem(name: str) -> str:
-    stem = Path(name).stem
+    stem = os.path.splitext(name)[0]
     stem = NOISE_PAT.sub("", stem)
-    stem = re.sub(r"[_\-\s]+", "_", stem).strip("_").lower()
+    stem = "_".join(stem.translate(SEPARATOR_TABLE).split()).lower()
     return stem
 
 
-def seq_sim(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+@lru_cache(maxsize=None)
+def candidate_matcher(stem: str) -> SequenceMatcher:
+    """Matcher with enhance *stem* as seq2, so its b2j index is built once per stem.
+
+    ratio() is not symmetric: callers set the main stem with set_seq1() to keep
+    the (main, enhance) argument order of SequenceMatcher(None, main, enhance).
+    """
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(stem)
+    return matcher
+
+
+def length_window(length: int, floor: float) -> Tuple[float, float]:
+    """Stem lengths that can reach *floor*, since ratio() <= 2*min(a, b)/(a + b)."""
+    slack = 1e-9  # keep the window a superset of the exact bound under float rounding
+    return length * floor / (2 - floor) - slack, length * (2 - floor) / floor + slack
+
+
+def build_char_index(stems: List[str]) -> Dict[str, List[Tuple[int, int]]]:
+    """Inverted index: character -> (stem index, occurrences) for each stem containing it."""
+    index: Dict[str, List[Tuple[int, int]]] = {}
+    for i, stem in enumerate(stems):
+        for char, count in Counter(stem).items():
+            index.setdefault(char, []).append((i, count))
+    return index
+
+
+def shared_char_counts(stem: str, char_index: Dict[str, List[Tuple[int, int]]]) -> Dict[int, int]:
+    """Multiset character overlap between *stem* and every indexed stem sharing a character.
+
+    2 * overlap / (len(a) + len(b)) is exactly quick_ratio(), an upper bound on
+    ratio(), so filtering on it never drops a stem that could reach the floor.
+    """
+    shared: Dict[int, int] = {}
+    for char, count in Counter(stem).items():
+        for idx, other in char_index.get(char, ()):
+            shared[idx] = shared.get(idx, 0) + min(count, other)
+    return shared
 
 
-def list_files(base: Path, name_filter=None) -> List[Path]:
+def list_files(base: Path, name_filter=None) -> List[os.DirEntry]:
+    """Walk *base* with os.scandir, returning file entries accepted by *name_filter*.
+
+    Files come out in the same order as ``base.rglob("*")``: a directory's files
+    in scan order, then each subdirectory in scan order, depth first. Row order
+    and exact-bucket tie-breaks depend on it.
+    """
     if not base.exists():
         return []
     out = []
-    for p in base.rglob("*"):
-        if p.is_file() and (name_filter(p) if name_filter else True):
-            out.append(p)
+    pending = [str(base)]
+    while pending:
+        subdirs = []
+        try:
+            scan = os.scandir(pending.pop())
+        except PermissionError:
+            continue  # unreadable directory: skip it, as rglob does
+        with scan as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file() and (name_filter(entry.name) if name_filter else True):
+                    out.append(entry)
+        # LIFO stack: push in reverse so the first subdirectory is walked first
+        pending.extend(reversed(subdirs))
     return out
 
 
-def file_record(stage: str, repo: Path, p: Path) -> Dict:
-    st = p.stat()
+def file_record(stage: str, repo: Path, entry: os.DirEntry) -> Dict:
+    st = entry.stat()
+    repo_prefix = str(repo) + os.sep
+    if entry.path.startswith(repo_prefix):
+        relative = entry.path[len(repo_prefix):]
+    else:
+        relative = os.path.relpath(entry.path, repo)
     return {
         "stage": stage,
-        "relative_path": p.relative_to(repo).as_posix(),
-        "filename": p.name,
+        "relative_path": relative.replace(os.sep, "/"),
+        "filename": entry.name,
         "bytes": st.st_size,
+        "size_readable": readable_size(st.st_size),
         "modified_iso": datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"),
-        "ext": p.suffix.lower(),
-        "stem": Path(p.name).stem,
-        "norm_stem": norm_stem(p.name),
+        "ext": os.path.splitext(entry.name)[1].lower(),
+        "stem": os.path.splitext(entry.name)[0],
+        "norm_stem": norm_stem(entry.name),
     }
 
 
+def collect_records(stage: str, repo: Path, entries: List[os.DirEntry]) -> List[Dict]:
+    """Build file records concurrently; stat() releases the GIL so latency overlaps."""
+    with ThreadPoolExecutor(max_workers=STAT_WORKERS) as pool:
+        return list(pool.map(lambda entry: file_record(stage, repo, entry), entries))
+
+
 def write_csv(path: Path, rows: List[Dict], fields: List[str]) -> None:
-    with path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({key: row.get(key, "") for key in fields})
+    # itemgetter with one key returns a bare value, which csv would split per character
+    getter = itemgetter(*fields) if len(fields) > 1 else (lambda row, key=fields[0]: (row[key],))
+    wanted = set(fields)
+    defaults = dict.fromkeys(fields, "")
+    with path.open("w", newline="", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(
+            getter(row) if row.keys() >= wanted else getter({**defaults, **row})
+            for row in rows
+        )
+
+
+def write_markdown(path: Path, lines: List[str]) -> None:
+    """Write *lines* newline-separated as UTF-8, encoding line by line instead of joining."""
+    with path.open("wb", buffering=WRITE_BUFFER) as f:
+        f.writelines(f"{line}\n".encode("utf-8") for line in lines[:-1])
+        if lines:
+            f.write(lines[-1].encode("utf-8"))
 
 
 def readable_size(n: int) -> str:
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if n < 1024 or unit == "TB":
-            return f"{n:.0f} {unit}" if unit == "B" else f"{n / 1024:.1f} {unit}"
-        n /= 1024
-    return f"{n:.0f} B"
+    if n < 1024:
+        return f"{n:.0f} B"
+    size = n / 1024
+    for unit in ("KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
 
 
 def choose_best_match(main: Dict, candidates: List[Dict]) -> Tuple[Optional[Dict], Dict[str, float]]:
     """Return best enhance candidate + scoring breakdown."""
-    nm = main["norm_stem"]
-    main_ext = main["ext"]
+    main_stem = main["norm_stem"]
+    allowed_exts = PREF_EXT.get(main["ext"], frozenset((main["ext"],)))
     main_bytes = max(int(main["bytes"]), 1)
 
     best: Optional[Dict] = None
     best_score = -1.0
-    best_breakdown: Dict[str, float] = {}
+    # Scalars only inside the loop; the breakdown dict is built once for the winner
+    best_sim = best_ext_bonus = best_size_bonus = best_size_ratio = 0.0
 
     for candidate in candidates:
-        sim = seq_sim(nm, candidate["norm_stem"])
         # Extension preference
-        ext_ok = candidate["ext"] in PREF_EXT.get(main_ext, [main_ext])
+        ext_ok = candidate["ext"] in allowed_exts
         ext_bonus = 0.06 if ext_ok else 0.0
 
         # Size proximity (not required, but rewarded)
@@ -112,22 +205,34 @@ def choose_best_match(main: Dict, candidates: List[Dict]) -> Tuple[Optional[Dict
         size_ok = size_delta <= SIZE_TOLERANCE
         size_bonus = 0.05 if size_ok else 0.0
 
+        # Skip the full ratio() when even its cheap upper bounds cannot beat the best score
+        matcher = candidate_matcher(candidate["norm_stem"])
+        matcher.set_seq1(main_stem)
+        if (matcher.real_quick_ratio() * 0.89) + ext_bonus + size_bonus <= best_score:
+            continue
+        if (matcher.quick_ratio() * 0.89) + ext_bonus + size_bonus <= best_score:
+            continue
+        sim = matcher.ratio()
+
         # Overall score: name similarity weighted highest
         score = (sim * 0.89) + ext_bonus + size_bonus
 
         if score > best_score:
             best = candidate
             best_score = score
-            best_breakdown = {
-                "name_sim": sim,
-                "ext_bonus": ext_bonus,
-                "size_bonus": size_bonus,
-                "size_ratio": size_ratio,
-                "score": score,
-            }
-
-    if best and best_breakdown.get("name_sim", 0.0) >= SIM_THRESHOLD:
-        return best, best_breakdown
+            best_sim = sim
+            best_ext_bonus = ext_bonus
+            best_size_bonus = size_bonus
+            best_size_ratio = size_ratio
+
+    if best and best_sim >= SIM_THRESHOLD:
+        return best, {
+            "name_sim": best_sim,
+            "ext_bonus": best_ext_bonus,
+            "size_bonus": best_size_bonus,
+            "size_ratio": best_size_ratio,
+            "score": best_score,
+        }
     return None, {
         "name_sim": 0.0,
         "score": 0.0,
@@ -149,14 +254,15 @@ def classify_status(main: Dict, match: Optional[Dict], metrics: Dict[str, float]
 
 
 def main() -> int:
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
     # Collect files
-    main_files = [
-        file_record("main", REPO, path)
-        for path in list_files(MAIN_DIR, lambda q: "_processed" in q.stem)
-    ]
-    enhance_files = [
-        file_record("enhance", REPO, path) for path in list_files(ENH_DIR)
-    ]
+    main_files = collect_records(
+        "main",
+        REPO,
+        list_files(MAIN_DIR, lambda name: "_processed" in os.path.splitext(name)[0]),
+    )
+    enhance_files = collect_records("enhance", REPO, list_files(ENH_DIR))
 
     # Write full manifest CSV
     manifest_rows = main_files + enhance_files
@@ -179,22 +285,39 @@ def main() -> int:
     bucket: Dict[str, List[Dict]] = {}
     for enhance in enhance_files:
         bucket.setdefault(enhance["norm_stem"], []).append(enhance)
+    # Column views of the enhance records for the fallback's inner loop
+    enhance_stems = [enhance["norm_stem"] for enhance in enhance_files]
+    enhance_lengths = [len(stem) for stem in enhance_stems]
+    # Character postings so the fuzzy fallback computes quick_ratio() bounds in bulk
+    char_index = build_char_index(enhance_stems)
 
     # Build candidate lists by proximity of normalized names (same or close)
     pairs = []
     for main_file in main_files:
         # Start with exact normalized stem bucket
         candidates = bucket.get(main_file["norm_stem"], [])
-        # If empty, broaden search: take top-N by fuzzy similarity against all enhance files (cheap scan)
+        # If empty, broaden search: take top-N by fuzzy similarity against all enhance files.
+        # Stems whose quick_ratio() bound (from the character index) misses the floor are
+        # skipped without losing matches; stems sharing no character score 0.
         if not candidates:
             scored: List[Tuple[float, Dict]] = []
             normalized = main_file["norm_stem"]
-            for enhance in enhance_files:
-                similarity = seq_sim(normalized, enhance["norm_stem"])
-                if similarity >= (SIM_THRESHOLD - 0.08):  # consider near-threshold for review
-                    scored.append((similarity, enhance))
-            scored.sort(key=lambda x: x[0], reverse=True)
-            candidates = [enhance for _, enhance in scored[:12]]  # cap to 12 nearest to keep scoring quick
+            min_len, max_len = length_window(len(normalized), FALLBACK_SIM_FLOOR)
+            shared = shared_char_counts(normalized, char_index)
+            for idx in sorted(shared):
+                length = enhance_lengths[idx]
+                if not min_len <= length <= max_len:
+                    continue
+                if 2.0 * shared[idx] / (len(normalized) + length) < FALLBACK_SIM_FLOOR:
+                    continue
+                matcher = candidate_matcher(enhance_stems[idx])
+                matcher.set_seq1(normalized)
+                similarity = matcher.ratio()
+                if similarity >= FALLBACK_SIM_FLOOR:
+                    scored.append((similarity, enhance_files[idx]))
+            # cap to 12 nearest to keep scoring quick; nlargest keeps ties in scan order like a stable sort
+            nearest = heapq.nlargest(12, scored, key=lambda x: x[0])
+            candidates = [enhance for _, enhance in nearest]
 
         match, metrics = choose_best_match(main_file, candidates)
         status = classify_status(main_file, match, metrics)
@@ -203,12 +326,12 @@ def main() -> int:
             "main_file": main_file["filename"],
             "main_ext": main_file["ext"],
             "main_bytes": main_file["bytes"],
-            "main_size_readable": readable_size(int(main_file["bytes"])),
+            "main_size_readable": main_file["size_readable"],
             "enh_path": match["relative_path"] if match else "",
             "enh_file": match["filename"] if match else "",
             "enh_ext": match["ext"] if match else "",
             "enh_bytes": match["bytes"] if match else "",
-            "enh_size_readable": readable_size(int(match["bytes"])) if match else "",
+            "enh_size_readable": match["size_readable"] if match else "",
             "name_similarity": f"{metrics.get('name_sim', 0.0):.3f}",
             "size_ratio": f"{metrics.get('size_ratio', 0.0):.3f}",
             "score": f"{metrics.get('score', 0.0):.3f}",
@@ -260,7 +383,7 @@ def main() -> int:
         rhs = f"`{row['enh_file']}`" if row["enh_file"] else "—"
         md.append(f"| {row['status']} | {row['score']} | {lhs} → {rhs} |\n")
 
-    (OUT_DIR / "pairs.md").write_text("\n".join(md), encoding="utf-8")
+    write_markdown(OUT_DIR / "pairs.md", md)
 
     # Full listings MD
     md2 = []
@@ -274,7 +397,7 @@ def main() -> int:
         key=lambda x: x["relative_path"],
     ):
         md2.append(
-            f"| `{record['relative_path']}` | {readable_size(int(record['bytes']))} | {record['modified_iso']} |\n"
+            f"| `{record['relative_path']}` | {record['size_readable']} | {record['modified_iso']} |\n"
         )
     md2.append("\n## Enhancement outputs (`output/`)\n| path | size | modified |\n|---|---:|---|\n")
     for record in sorted(
@@ -282,9 +405,9 @@ def main() -> int:
         key=lambda x: x["relative_path"],
     ):
         md2.append(
-            f"| `{record['relative_path']}` | {readable_size(int(record['bytes']))} | {record['modified_iso']} |\n"
+            f"| `{record['relative_path']}` | {record['size_readable']} | {record['modified_iso']} |\n"
         )
-    (OUT_DIR / "processed_manifest.md").write_text("\n".join(md2), encoding="utf-8")
+    write_markdown(OUT_DIR / "processed_manifest.md", md2)
 
     print("Wrote:")
     print(f"  - {OUT_DIR / 'processed_manifest.csv'}")
@@ -4,59 +4,118 @@ PR Safety Check Script
 
 This script provides automated checks to verify if it's safe to delete specific PRs.
 It analyzes the codebase for dependencies, references, and potential impacts.
+
+Usage:
+    python scripts/pr_safety_check.py 6 7 --run-tests
+
+The test suite only runs with --run-tests. Without it the report still checks
+code and git history, but never declares the PRs safe to delete.
 """
 
+import argparse
+import mmap
+import multiprocessing
 import os
 import re
+import signal
 import subprocess
-import sys
+import threading
+from functools import partial
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
+
+# PR reference forms (GitHub style #123, PR 123, pull request 123) as one
+# alternation so each file is scanned once. Bytes pattern: runs over mmap.
+PR_REFERENCE_PATTERN = re.compile(
+    rb'#(\d+)|PR\s*(\d+)|pull\s*request\s*(\d+)',
+    re.IGNORECASE,
+)
+
+# File extensions to search
+PR_REFERENCE_EXTENSIONS = {'.py', '.md', '.yml', '.yaml', '.json', '.txt', '.rst'}
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_SCAN_MIN_FILES = 256
+
+# Upper bound, in seconds, on the whole git log scan
+GIT_LOG_TIMEOUT = 30
+
+
+def _scan_file(file_path: Path, root_dir: str, wanted: Set[int]) -> List[Tuple[int, str]]:
+    """
+    Scan a single file for PR references.
+    
+    Args:
+        file_path: File to scan
+        root_dir: Root directory used to relativize the reported path
+        wanted: PR numbers of interest
+        
+    Returns:
+        List of (PR number, relative path) pairs, one per matching reference
+    """
+    found = []
+    try:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            for match in PR_REFERENCE_PATTERN.finditer(content):
+                pr_num = int(match.group(match.lastindex))
+                if pr_num in wanted:
+                    found.append((pr_num, os.path.relpath(file_path, root_dir)))
+    except (IOError, ValueError):
+        # Empty files cannot be mapped and unreadable files are skipped
+        pass
+    return found
 
 
-def find_pr_references(root_dir: str, pr_numbers: List[int]) -> Dict[int, List[str]]:
+def find_pr_references(
+    root_dir: str,
+    pr_numbers: List[int],
+    processes: Optional[int] = None,
+) -> Dict[int, List[str]]:
     """
     Search for references to specific PR numbers in the codebase.
     
     Args:
         root_dir: Root directory to search
         pr_numbers: List of PR numbers to search for
+        processes: Worker processes for the scan (defaults to the CPU count).
+            Small trees are scanned in-process since pool startup would dominate.
         
     Returns:
         Dictionary mapping PR number to list of files containing references
     """
     references = {pr: [] for pr in pr_numbers}
+    scan = partial(_scan_file, root_dir=root_dir, wanted=set(pr_numbers))
     
-    # Patterns to match PR references
-    patterns = [
-        r'#(\d+)',  # GitHub style #123
-        r'PR\s*(\d+)',  # PR 123
-        r'pull\s*request\s*(\d+)',  # pull request 123
+    file_paths = [
+        file_path for file_path in Path(root_dir).rglob('*')
+        if file_path.is_file() and file_path.suffix.lower() in PR_REFERENCE_EXTENSIONS
     ]
     
-    # File extensions to search
-    extensions = {'.py', '.md', '.yml', '.yaml', '.json', '.txt', '.rst'}
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and len(file_paths) >= PARALLEL_SCAN_MIN_FILES:
+        with multiprocessing.Pool(processes) as pool:
+            results = list(pool.imap(scan, file_paths, chunksize=64))
+    else:
+        results = [scan(file_path) for file_path in file_paths]
     
-    for file_path in Path(root_dir).rglob('*'):
-        if file_path.is_file() and file_path.suffix.lower() in extensions:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        pr_num = int(match.group(1))
-                        if pr_num in pr_numbers:
-                            relative_path = os.path.relpath(file_path, root_dir)
-                            references[pr_num].append(relative_path)
-                            
-            except (IOError, ValueError, UnicodeDecodeError):
-                continue
+    for found in results:
+        for pr_num, relative_path in found:
+            references[pr_num].append(relative_path)
                 
     return references
 
 
+def _kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill *proc* and, on POSIX, any children sharing its session."""
+    try:
+        if os.name == 'posix':
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
 def check_git_history(pr_numbers: List[int]) -> Dict[int, List[str]]:
     """
     Check git history for references to PR numbers.
@@ -68,23 +127,43 @@ def check_git_history(pr_numbers: List[int]) -> Dict[int, List[str]]:
         Dictionary mapping PR number to list of commits containing references
     """
     references = {pr: [] for pr in pr_numbers}
+    # Lower-case the needles once instead of per line
+    needles = {
+        pr_num: [f'#{pr_num}', f'pr {pr_num}', f'pull request {pr_num}']
+        for pr_num in pr_numbers
+    }
+    found = {pr: [] for pr in pr_numbers}
     
     try:
-        # Get all commit messages
-        result = subprocess.run(
+        # Stream commit messages rather than buffering the whole log
+        with subprocess.Popen(
             ['git', 'log', '--all', '--oneline'],
-            capture_output=True, text=True, timeout=30
-        )
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            start_new_session=(os.name == 'posix'),
+        ) as proc:
+            # Kill git once the deadline passes so reading stdout cannot block
+            # indefinitely; a killed run exits non-zero and is discarded below.
+            deadline = threading.Timer(GIT_LOG_TIMEOUT, _kill_process_tree, (proc,))
+            deadline.start()
+            try:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lowered = line.lower()
+                    for pr_num, patterns in needles.items():
+                        if any(pattern in lowered for pattern in patterns):
+                            found[pr_num].append(line)
+                returncode = proc.wait()
+            finally:
+                deadline.cancel()
+                if proc.poll() is None:
+                    _kill_process_tree(proc)
         
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    for pr_num in pr_numbers:
-                        patterns = [f'#{pr_num}', f'PR {pr_num}', f'pull request {pr_num}']
-                        if any(pattern.lower() in line.lower() for pattern in patterns):
-                            references[pr_num].append(line.strip())
+        if returncode == 0:
+            references = found
                             
-    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
+    except (subprocess.CalledProcessError, FileNotFoundError):
         pass
         
     return references
@@ -98,8 +177,10 @@ def run_tests() -> bool:
         True if all tests pass, False otherwise
     """
     try:
+        # Quiet, fail-fast and without the cache plugin: only the exit status matters
         result = subprocess.run(
-            ['python', '-m', 'pytest', 'tests/', '-v'],
+            ['python', '-m', 'pytest', 'tests/', '-x', '-q', '--no-header',
+             '-p', 'no:cacheprovider', '--import-mode=importlib'],
             capture_output=True, text=True, timeout=180
         )
         return result.returncode == 0
@@ -107,13 +188,18 @@ def run_tests() -> bool:
         return False
 
 
-def generate_safety_report(pr_numbers: List[int], root_dir: str = '.') -> str:
+def generate_safety_report(
+    pr_numbers: List[int],
+    root_dir: str = '.',
+    include_tests: bool = False,
+) -> str:
     """
     Generate a comprehensive safety report for PR deletion.
     
     Args:
         pr_numbers: List of PR numbers to analyze
         root_dir: Root directory of the repository
+        include_tests: Also run the test suite (slow); skipped by default
         
     Returns:
         Formatted safety report as string
@@ -160,8 +246,11 @@ def generate_safety_report(pr_numbers: List[int], root_dir: str = '.') -> str:
     
     # Run tests
     report.append("🧪 TEST SUITE:")
-    tests_pass = run_tests()
-    if tests_pass:
+    tests_run = include_tests
+    tests_pass = run_tests() if tests_run else False
+    if not tests_run:
+        report.append("  Not run (pass --run-tests to include) ⏭️")
+    elif tests_pass:
         report.append("  All tests passing ✅")
     else:
         report.append("  Some tests failing ❌")
@@ -177,11 +266,14 @@ def generate_safety_report(pr_numbers: List[int], root_dir: str = '.') -> str:
     if found_git_refs:
         risk_score += 2
         report.append("  MEDIUM RISK: Git history references found ⚠️")
-    if not tests_pass:
+    if tests_run and not tests_pass:
         risk_score += 2
         report.append("  MEDIUM RISK: Tests failing ❌")
     
-    if risk_score == 0:
+    # Without a test run the verdict can only speak to references
+    if risk_score == 0 and not tests_run:
+        report.append("  NO REFERENCES FOUND: Tests not run, assessment incomplete ⚠️")
+    elif risk_score == 0:
         report.append("  SAFE TO DELETE: No dependencies found ✅")
     elif risk_score <= 2:
         report.append("  EXERCISE CAUTION: Low risk dependencies found ⚠️")
@@ -190,7 +282,10 @@ def generate_safety_report(pr_numbers: List[int], root_dir: str = '.') -> str:
     
     report.append("")
     report.append("📋 RECOMMENDATIONS:")
-    if risk_score == 0:
+    if risk_score == 0 and not tests_run:
+        report.append("  - No references found; tests not run")
+        report.append("  - Re-run with --run-tests before deleting these PRs")
+    elif risk_score == 0:
         report.append("  - PRs can be safely deleted")
         report.append("  - Consider archiving any valuable discussions first")
     elif risk_score <= 2:
@@ -207,23 +302,33 @@ def generate_safety_report(pr_numbers: List[int], root_dir: str = '.') -> str:
 
 def main():
     """Main entry point for the PR safety check script."""
-    if len(sys.argv) < 2:
-        print("Usage: python pr_safety_check.py <PR_NUMBER> [PR_NUMBER ...]")
-        print("Example: python pr_safety_check.py 6 7")
-        sys.exit(1)
-    
-    try:
-        pr_numbers = [int(arg) for arg in sys.argv[1:]]
-    except ValueError:
-        print("Error: All arguments must be valid PR numbers")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Check whether it is safe to delete the given PRs.",
+        epilog="Example: python pr_safety_check.py 6 7 --run-tests",
+    )
+    parser.add_argument(
+        "pr_numbers",
+        nargs="+",
+        type=int,
+        metavar="PR_NUMBER",
+        help="PR numbers to analyze.",
+    )
+    parser.add_argument(
+        "--run-tests",
+        action="store_true",
+        help=(
+            "Also run the test suite as part of the assessment. Without it the "
+            "report never declares the PRs safe to delete."
+        ),
+    )
+    args = parser.parse_args()
     
     # Change to repository root if script is run from scripts directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     if script_dir.endswith('scripts'):
         os.chdir(os.path.dirname(script_dir))
     
-    report = generate_safety_report(pr_numbers)
+    report = generate_safety_report(args.pr_numbers, include_tests=args.run_tests)
     print(report)
 
 
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Optional, Tuple, Union
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter, ImageStat
 
 
 def _ensure_rgb(image: Image.Image) -> Image.Image:
@@ -21,9 +23,10 @@ def _ensure_rgb(image: Image.Image) -> Image.Image:
 
 
 def _split_alpha(image: Image.Image):
-    if image.mode == "RGBA":
-        rgb, alpha = image.convert("RGBA"), image.getchannel("A")
-        return rgb.convert("RGB"), alpha
+    # Any mode carrying alpha (RGBA, LA, PA, RGBa) keeps it, not just RGBA.
+    if "A" in image.getbands() or "a" in image.getbands():
+        rgba = image.convert("RGBA")
+        return rgba.convert("RGB"), rgba.getchannel("A")
     return _ensure_rgb(image), None
 
 
@@ -55,45 +58,136 @@ def _resolve_enhance_factor(value: float) -> float:
     return factor
 
 
-def apply_temperature_shift(image: Image.Image, mired_shift: float) -> Image.Image:
-    """Warm (+) or cool (-) an image by adjusting channel gains."""
+_LUT_INPUT = np.arange(256, dtype=np.float32)
 
-    if not mired_shift:
-        return image.copy()
 
-    base_rgb, alpha = _split_alpha(image)
-    arr = np.asarray(base_rgb).astype(np.float32)
+def _blend_table(degenerate: int, factor: float) -> np.ndarray:
+    """Return the ``uint8`` table for blending a flat *degenerate* level.
+
+    Mirrors ``Image.blend(flat, image, factor)`` bit for bit: Pillow computes
+    ``in1 + alpha * (in2 - in1)`` in single precision, clips, and truncates.
+    ``ImageEnhance.Brightness`` blends against ``0`` and
+    ``ImageEnhance.Contrast`` against the rounded mean luminance.
+    """
+
+    base = np.float32(degenerate)
+    values = base + np.float32(factor) * (_LUT_INPUT - base)
+    return np.clip(values, 0.0, 255.0).astype(np.uint8)
+
+
+@lru_cache(maxsize=64)
+def _temperature_tables(mired_shift: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-channel ``uint8`` lookup tables for a temperature shift.
 
-    gain = 1.0 + (mired_shift / 100.0)
+    Tables are cached per shift (manifests reuse a handful of values across
+    many frames) and returned read-only so the cached copies stay intact.
+    """
+
+    gain = 1.0 + (float(mired_shift) / 100.0)
     gain = max(0.1, min(10.0, gain))
 
-    red_gain = gain
-    blue_gain = 1.0 / gain
+    tables = []
+    for channel_gain in np.array([gain, 1.0, 1.0 / gain], dtype=np.float32):
+        values = np.clip(_LUT_INPUT * channel_gain, 0.0, 255.0).astype(np.uint8)
+        values.flags.writeable = False
+        tables.append(values)
+    return tables[0], tables[1], tables[2]
 
-    gains = np.array([red_gain, 1.0, blue_gain], dtype=np.float32)
-    arr *= gains
-    np.clip(arr, 0.0, 255.0, out=arr)
 
-    warmed = Image.fromarray(arr.astype(np.uint8), mode="RGB")
-    return _recombine_alpha(warmed, alpha, image.mode)
+@lru_cache(maxsize=64)
+def _shadow_curve(amount: float) -> np.ndarray:
+    """Return the cached, read-only ``uint8`` curve for :func:`apply_shadow_lift`."""
 
+    amount = max(0.0, min(1.0, float(amount)))
+    values = _LUT_INPUT / 255.0
 
-def apply_shadow_lift(image: Image.Image, amount: float) -> Image.Image:
-    """Lift the shadows by mixing dark pixels toward mid-tones."""
+    shadow_mask = 1.0 - np.clip(values / 0.5, 0.0, 1.0)
+    lifted = np.clip(values + amount * shadow_mask, 0.0, 1.0)
+    curve = (lifted * 255.0).astype(np.uint8)
+    curve.flags.writeable = False
+    return curve
 
-    if not amount:
-        return image.copy()
+
+@lru_cache(maxsize=64)
+def _highlight_curve(amount: float) -> np.ndarray:
+    """Return the cached, read-only ``uint8`` curve for :func:`apply_highlight_lift`."""
 
     amount = max(0.0, min(1.0, float(amount)))
+    values = _LUT_INPUT / 255.0
+
+    highlight_mask = np.clip((values - 0.5) / 0.5, 0.0, 1.0)
+    lifted = np.clip(values + amount * highlight_mask * (1.0 - values), 0.0, 1.0)
+    curve = (lifted * 255.0).astype(np.uint8)
+    curve.flags.writeable = False
+    return curve
+
+
+def _tone_tables(
+    temperature_shift: Optional[float],
+    shadow_lift: Optional[float],
+    highlight_lift: Optional[float],
+) -> List[np.ndarray]:
+    """Compose temperature, shadow and highlight stages into RGB tables.
+
+    Each stage maps a channel value to a channel value, so chaining their
+    ``uint8`` tables reproduces the stage-by-stage result exactly.
+    """
+
+    if temperature_shift:
+        channels = list(_temperature_tables(temperature_shift))
+    else:
+        channels = [_LUT_INPUT.astype(np.uint8)] * 3
+
+    if shadow_lift:
+        curve = _shadow_curve(shadow_lift)
+        channels = [curve[channel] for channel in channels]
+
+    if highlight_lift:
+        curve = _highlight_curve(highlight_lift)
+        channels = [curve[channel] for channel in channels]
+
+    return channels
+
+
+def _chain_tables(
+    first: Optional[List[np.ndarray]], then: List[np.ndarray]
+) -> List[np.ndarray]:
+    """Return per-channel tables applying *first* and then *then*."""
+
+    if first is None:
+        return list(then)
+    return [table[channel] for channel, table in zip(first, then)]
+
+
+def _apply_tables(image: Image.Image, channels: List[np.ndarray]) -> Image.Image:
+    """Map an RGB *image* through per-channel ``uint8`` tables in one pass."""
+
+    return image.point(np.concatenate(channels).tolist())
+
+
+def apply_temperature_shift(image: Image.Image, mired_shift: float) -> Image.Image:
+    """Warm (+) or cool (-) an image by adjusting channel gains."""
+
+    if not mired_shift:
+        return image
 
     base_rgb, alpha = _split_alpha(image)
-    arr = np.asarray(base_rgb).astype(np.float32) / 255.0
 
-    shadow_mask = 1.0 - np.clip(arr / 0.5, 0.0, 1.0)
-    lifted = arr + amount * shadow_mask
-    lifted = np.clip(lifted, 0.0, 1.0)
+    # A per-channel gain only ever sees 256 input values; a uint8 table keeps
+    # the frame in uint8 instead of widening it to float32.
+    warmed = _apply_tables(base_rgb, list(_temperature_tables(mired_shift)))
+    return _recombine_alpha(warmed, alpha, image.mode)
+
+
+def apply_shadow_lift(image: Image.Image, amount: float) -> Image.Image:
+    """Lift the shadows by mixing dark pixels toward mid-tones."""
 
-    result = Image.fromarray((lifted * 255.0).astype(np.uint8), mode="RGB")
+    if not amount:
+        return image
+
+    base_rgb, alpha = _split_alpha(image)
+    curve = _shadow_curve(amount)
+    result = _apply_tables(base_rgb, [curve] * 3)
     return _recombine_alpha(result, alpha, image.mode)
 
 
@@ -101,18 +195,11 @@ def apply_highlight_lift(image: Image.Image, amount: float) -> Image.Image:
     """Lift highlights toward white without blowing them out."""
 
     if not amount:
-        return image.copy()
-
-    amount = max(0.0, min(1.0, float(amount)))
+        return image
 
     base_rgb, alpha = _split_alpha(image)
-    arr = np.asarray(base_rgb).astype(np.float32) / 255.0
-
-    highlight_mask = np.clip((arr - 0.5) / 0.5, 0.0, 1.0)
-    lifted = arr + amount * highlight_mask * (1.0 - arr)
-    lifted = np.clip(lifted, 0.0, 1.0)
-
-    result = Image.fromarray((lifted * 255.0).astype(np.uint8), mode="RGB")
+    curve = _highlight_curve(amount)
+    result = _apply_tables(base_rgb, [curve] * 3)
     return _recombine_alpha(result, alpha, image.mode)
 
 
@@ -120,21 +207,20 @@ def apply_local_contrast(image: Image.Image, amount: float, radius: float = 2.0)
     """Adjust local contrast using an unsharp mask style enhancement."""
 
     if amount is None or amount == 1.0:
-        return image.copy()
+        return image
 
     amount = float(amount)
-    base = image.copy()
 
     if amount > 1.0:
         percent = min(500, max(0, int((amount - 1.0) * 200)))
         if percent == 0:
-            return base
-        return base.filter(ImageFilter.UnsharpMask(radius=radius, percent=percent, threshold=0))
+            return image
+        return image.filter(ImageFilter.UnsharpMask(radius=radius, percent=percent, threshold=0))
 
     # Reduce local contrast by blending with a blurred version.
     blend_factor = max(0.0, min(1.0, 1.0 - amount))
-    blurred = base.filter(ImageFilter.GaussianBlur(radius=radius))
-    return Image.blend(base, blurred, blend_factor)
+    blurred = image.filter(ImageFilter.GaussianBlur(radius=radius))
+    return Image.blend(image, blurred, blend_factor)
 
 
 def inpaint_with_mask(
@@ -176,19 +262,15 @@ def inpaint_with_mask(
     if feather_radius > 0:
         mask_image = mask_image.filter(ImageFilter.GaussianBlur(radius=float(feather_radius)))
 
-    mask_arr = np.asarray(mask_image, dtype=np.float32) / 255.0
-    mask_arr *= max(0.0, min(1.0, float(strength)))
+    strength = max(0.0, min(1.0, float(strength)))
+    if strength < 1.0:
+        mask_image = mask_image.point(_blend_table(0, strength).tolist())
 
     blurred = base_rgb.filter(ImageFilter.GaussianBlur(radius=float(max(0.0, blur_radius))))
 
-    base_arr = np.asarray(base_rgb, dtype=np.float32)
-    blurred_arr = np.asarray(blurred, dtype=np.float32)
-
-    blend = mask_arr[..., None]
-    filled = base_arr * (1.0 - blend) + blurred_arr * blend
-
-    filled = np.clip(filled, 0.0, 255.0).astype(np.uint8)
-    filled_image = Image.fromarray(filled, mode="RGB")
+    # Pillow blends through the 8-bit mask in C, so no float copies of the
+    # frame are needed.
+    filled_image = Image.composite(blurred, base_rgb, mask_image)
 
     return _recombine_alpha(filled_image, alpha, image.mode)
 
@@ -243,53 +325,149 @@ def enhance_material_definition(
     return _recombine_alpha(result, alpha, image.mode)
 
 
-def apply_grading(image: Image.Image, grading: Optional[Dict[str, float]]) -> Image.Image:
+def _optional_float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+@dataclass(frozen=True)
+class GradingPlan:
+    """Grading parameters resolved once and reusable across many frames.
+
+    Fields left as ``None`` skip their stage. Enhancement factors are already
+    in Pillow's multiplier form; see :meth:`from_mapping` for the manifest
+    conventions they are resolved from.
+    """
+
+    exposure_factor: Optional[float] = None
+    contrast_factor: Optional[float] = None
+    saturation_factor: Optional[float] = None
+    temperature_shift: Optional[float] = None
+    shadow_lift: Optional[float] = None
+    highlight_lift: Optional[float] = None
+    micro_contrast: Optional[float] = None
+
+    @classmethod
+    def from_mapping(cls, grading: Optional[Mapping[str, float]]) -> "GradingPlan":
+        """Resolve a manifest grading mapping into a :class:`GradingPlan`."""
+
+        if not grading:
+            return cls()
+
+        exposure = grading.get("exposure")
+        contrast = grading.get("contrast")
+        saturation = grading.get("saturation")
+        micro_contrast = grading.get("micro_contrast")
+        if micro_contrast is None:
+            micro_contrast = grading.get("local_contrast")
+
+        return cls(
+            exposure_factor=None if exposure is None else 1 + float(exposure),
+            contrast_factor=None if contrast is None else _resolve_enhance_factor(contrast),
+            saturation_factor=None if saturation is None else _resolve_enhance_factor(saturation),
+            # Zero shifts and lifts are no-ops, matching the truthiness checks
+            # manifests have always relied on.
+            temperature_shift=_optional_float(grading.get("temperature_shift") or None),
+            shadow_lift=_optional_float(grading.get("shadow_lift") or None),
+            highlight_lift=_optional_float(grading.get("highlight_lift") or None),
+            micro_contrast=_optional_float(micro_contrast),
+        )
+
+    def __bool__(self) -> bool:
+        return any(value is not None for value in vars(self).values())
+
+
+# Modes ImageEnhance grades in their own channels (brightening CMYK adds ink).
+# The lookup tables below work in RGB, so these keep the direct path for the
+# exposure, contrast and saturation stages.
+_NATIVE_ENHANCE_MODES = frozenset({"CMYK", "YCbCr", "HSV"})
+
+
+def _enhance_native(image: Image.Image, plan: GradingPlan) -> Image.Image:
+    if plan.exposure_factor is not None:
+        image = ImageEnhance.Brightness(image).enhance(plan.exposure_factor)
+    if plan.contrast_factor is not None:
+        image = ImageEnhance.Contrast(image).enhance(plan.contrast_factor)
+    if plan.saturation_factor is not None:
+        image = ImageEnhance.Color(image).enhance(plan.saturation_factor)
+    return image
+
+
+def apply_grading(
+    image: Image.Image,
+    grading: Union[Mapping[str, float], GradingPlan, None],
+) -> Image.Image:
     """Apply grading primitives in a predictable order.
     
     Supports both advanced grading parameters (temperature_shift, shadow_lift, 
     highlight_lift, micro_contrast/local_contrast) and simple parameters 
     (exposure, contrast, saturation) for compatibility with YAML manifests.
-    """
-
-    if not grading:
-        return image.copy()
-
-    result = image.copy()
-
-    # Handle simple grading parameters first (for YAML manifest compatibility)
-    exposure = grading.get("exposure")
-    if exposure is not None:
-        from PIL import ImageEnhance
-        result = ImageEnhance.Brightness(result).enhance(1 + float(exposure))
+    Batch callers can pass a :class:`GradingPlan` resolved once up front.
 
-    contrast = grading.get("contrast")
-    if contrast is not None:
-        from PIL import ImageEnhance
-        result = ImageEnhance.Contrast(result).enhance(_resolve_enhance_factor(contrast))
-
-    saturation = grading.get("saturation")
-    if saturation is not None:
-        from PIL import ImageEnhance
-        result = ImageEnhance.Color(result).enhance(_resolve_enhance_factor(saturation))
-
-    # Handle advanced grading parameters
-    temp_shift = grading.get("temperature_shift")
-    if temp_shift:
-        result = apply_temperature_shift(result, temp_shift)
+    Like the individual primitives, returns *image* itself rather than a copy
+    when no stage changes it.
+    """
 
-    shadow_lift = grading.get("shadow_lift")
-    if shadow_lift:
-        result = apply_shadow_lift(result, shadow_lift)
+    if isinstance(grading, Mapping) or grading is None:
+        plan = GradingPlan.from_mapping(grading)
+    else:
+        plan = grading
 
-    highlight_lift = grading.get("highlight_lift")
-    if highlight_lift:
-        result = apply_highlight_lift(result, highlight_lift)
+    if not plan:
+        return image
 
-    micro_contrast = grading.get("micro_contrast") if grading.get("micro_contrast") is not None else grading.get("local_contrast")
-    if micro_contrast is not None:
-        result = apply_local_contrast(result, micro_contrast)
+    if image.mode in _NATIVE_ENHANCE_MODES:
+        image = _enhance_native(image, plan)
+        plan = replace(plan, exposure_factor=None, contrast_factor=None, saturation_factor=None)
+        if not plan:
+            return image
 
-    return result
+    # Split alpha once and grade the RGB plane; the alpha channel (and any
+    # non-RGB mode) is restored once at the end.
+    if image.mode == "RGB":
+        plane, alpha = image, None
+    else:
+        plane, alpha = _split_alpha(image)
+    result = plane
+
+    # Per-channel stages accumulate into ``pending`` lookup tables and are
+    # applied in a single pass; only stages that need real pixels (the
+    # contrast mean, saturation and local contrast) force the tables out.
+    pending: Optional[List[np.ndarray]] = None
+
+    # Handle simple grading parameters first (for YAML manifest compatibility).
+    # Brightness and contrast blend against a flat level, so they reduce to
+    # lookup tables identical to ImageEnhance without building the flat image.
+    if plan.exposure_factor is not None:
+        table = _blend_table(0, plan.exposure_factor)
+        pending = _chain_tables(pending, [table] * 3)
+
+    if plan.contrast_factor is not None:
+        if pending is not None:
+            result, pending = _apply_tables(result, pending), None
+        mean = int(ImageStat.Stat(result.convert("L")).mean[0] + 0.5)
+        table = _blend_table(mean, plan.contrast_factor)
+        pending = _chain_tables(pending, [table] * 3)
+
+    if plan.saturation_factor is not None:
+        if pending is not None:
+            result, pending = _apply_tables(result, pending), None
+        result = ImageEnhance.Color(result).enhance(plan.saturation_factor)
+
+    # Handle advanced grading parameters. Temperature, shadow and highlight
+    # are per-channel tone curves as well.
+    if plan.temperature_shift or plan.shadow_lift or plan.highlight_lift:
+        tone = _tone_tables(plan.temperature_shift, plan.shadow_lift, plan.highlight_lift)
+        pending = _chain_tables(pending, tone)
+
+    if pending is not None:
+        result = _apply_tables(result, pending)
+
+    if plan.micro_contrast is not None:
+        result = apply_local_contrast(result, plan.micro_contrast)
+
+    if result is plane:
+        return image
+    return _recombine_alpha(result, alpha, image.mode)
 
 
 # Crop presets for architectural renderings
@@ -302,6 +480,11 @@ CROP_PRESETS: Dict[str, Tuple[int, int]] = {
     "square_1x1": (1, 1),
 }
 
+# Preset ratios resolved once so per-image crops skip the tuple division.
+_CROP_RATIOS: Dict[str, float] = {
+    name: width / height for name, (width, height) in CROP_PRESETS.items()
+}
+
 
 def _clamp(value: float, minimum: float, maximum: float) -> float:
     """Clamp *value* between *minimum* and *maximum*."""
@@ -319,6 +502,7 @@ def _normalize_offset(offset: Iterable[float] | None) -> Tuple[float, float]:
     return (_clamp(float(x), -1.0, 1.0), _clamp(float(y), -1.0, 1.0))
 
 
+@lru_cache(maxsize=256)
 def _crop_box(
     original: Tuple[int, int],
     target_ratio: float,
@@ -329,6 +513,9 @@ def _crop_box(
     The offset is expressed in the normalized range ``[-1, 1]`` where ``0`` is
     center, ``-1`` biases towards the top/left edge, and ``+1`` biases towards
     the bottom/right edge.
+
+    Results are memoized: batch renders crop many same-sized frames with the
+    same preset and offset.
     """
 
     width, height = original
@@ -373,13 +560,24 @@ def crop_to_aspect(
             the bottom-right corner. Values outside the valid range are clamped.
 
     Returns:
-        ``Image.Image``: A new image cropped to the requested aspect ratio.
+        ``Image.Image``: The image cropped to the requested aspect ratio. When
+        *image* already has that ratio no crop is needed and *image* itself is
+        returned rather than a copy, so callers must not mutate the result in
+        place if they still rely on the source.
     """
 
-    target_ratio = aspect[0] / aspect[1]
-    normalized_offset = _normalize_offset(offset)
-    left, top, right, bottom = _crop_box(image.size, target_ratio, normalized_offset)
-    return image.crop((left, top, right, bottom))
+    return _crop_to_ratio(image, aspect[0] / aspect[1], offset)
+
+
+def _crop_to_ratio(
+    image: Image.Image, target_ratio: float, offset: Iterable[float] | None
+) -> Image.Image:
+    """Crop *image* to *target_ratio*; see :func:`crop_to_aspect`."""
+
+    box = _crop_box(image.size, target_ratio, _normalize_offset(offset))
+    if box == (0, 0) + image.size:
+        return image
+    return image.crop(box)
 
 
 def apply_crop_preset(
@@ -399,25 +597,25 @@ def apply_crop_preset(
         KeyError: If the preset name is not recognized.
     """
 
-    if preset not in CROP_PRESETS:
+    if preset not in _CROP_RATIOS:
         raise KeyError(f"Unknown crop preset: {preset}")
 
-    return crop_to_aspect(image, CROP_PRESETS[preset], offset=offset)
+    return _crop_to_ratio(image, _CROP_RATIOS[preset], offset)
 
 
 def hero_21x9(image: Image.Image, offset: Iterable[float] | None = None) -> Image.Image:
     """Crop *image* to a cinematic 21:9 hero frame."""
 
-    return crop_to_aspect(image, CROP_PRESETS["hero_21x9"], offset=offset)
+    return _crop_to_ratio(image, _CROP_RATIOS["hero_21x9"], offset)
 
 
 def card_4x3(image: Image.Image, offset: Iterable[float] | None = None) -> Image.Image:
     """Crop *image* to a 4:3 ratio suitable for gallery cards."""
 
-    return crop_to_aspect(image, CROP_PRESETS["card_4x3"], offset=offset)
+    return _crop_to_ratio(image, _CROP_RATIOS["card_4x3"], offset)
 
 
 def web_16x9(image: Image.Image, offset: Iterable[float] | None = None) -> Image.Image:
     """Crop *image* to the ubiquitous 16:9 web-safe aspect."""
 
-    return crop_to_aspect(image, CROP_PRESETS["web_16x9"], offset=offset)
+    return _crop_to_ratio(image, _CROP_RATIOS["web_16x9"], offset)
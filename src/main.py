@@ -8,6 +8,7 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -20,6 +21,7 @@ except ImportError:
 # Add src directory to path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
+from adjustments import GradingPlan
 from processing import process_image, process_variant
 from config import (
     ASPECT_RATIO_PRESETS,
@@ -47,9 +49,10 @@ def get_image_files(directory):
         print(f"Input directory '{directory}' does not exist.")
         return image_files
     
-    for file in os.listdir(directory):
-        if any(file.lower().endswith(ext) for ext in image_extensions):
-            image_files.append(os.path.join(directory, file))
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in image_extensions:
+                image_files.append(entry.path)
 
     return sorted(image_files)
 
@@ -279,7 +282,8 @@ def build_jobs(
             output_name = f"{stem}_processed{ext}"
 
         crop_box = _parse_crop(entry)
-        grading = _extract_grading(entry)
+        # Resolve grading up front so process_image receives a ready plan.
+        grading = GradingPlan.from_mapping(_extract_grading(entry))
 
         jobs.append(
             {
@@ -294,12 +298,32 @@ def build_jobs(
     return jobs
 
 
+def _run_job(job: Dict) -> bool:
+    """Process a single job built by :func:`build_jobs`."""
+
+    return process_image(
+        job["input"],
+        job["output"],
+        target_size=job["target_size"],
+        crop_box=job["crop_box"],
+        grading=job["grading"],
+    )
+
+
 def run_pipeline(
     input_dir: Path = Path(INPUT_DIR),
     output_dir: Path = Path(OUTPUT_DIR),
     target_size: Tuple[int, int] = DCI_4K_RESOLUTION,
     manifest_path: Optional[Path] = None,
+    workers: Optional[int] = 1,
 ):
+    """Process every image in *input_dir* according to the JSON manifest.
+
+    Jobs are independent, so with ``workers`` greater than one they are
+    spread over a process pool (``None`` uses every CPU). Results keep the
+    job order either way.
+    """
+
     input_dir = Path(input_dir)
     output_dir = Path(output_dir)
     manifest_path = Path(manifest_path) if manifest_path else input_dir / "manifest.json"
@@ -312,14 +336,14 @@ def run_pipeline(
     processed = []
     failed = []
 
-    for job in jobs:
-        success = process_image(
-            job["input"],
-            job["output"],
-            target_size=job["target_size"],
-            crop_box=job["crop_box"],
-            grading=job["grading"],
-        )
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            outcomes = list(executor.map(_run_job, jobs))
+    else:
+        outcomes = [_run_job(job) for job in jobs]
+
+    for job, success in zip(jobs, outcomes):
         if success:
             processed.append(job["output"])
         else:
@@ -360,6 +384,12 @@ def main(argv: List[str] | None = None) -> int:
         action="store_true",
         help="Use legacy JSON manifest processing instead of YAML.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the legacy pipeline (default 1; 0 uses every CPU).",
+    )
     parser.add_argument(
         "paths",
         nargs="*",
@@ -395,11 +425,18 @@ def main(argv: List[str] | None = None) -> int:
     else:
         output_dir = args.output_dir or Path(OUTPUT_DIR)
 
+    if args.workers is not None and not args.legacy:
+        parser.error("--workers is only supported with --legacy.")
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers must be zero or a positive integer.")
+
     if args.legacy:
+        workers = 1 if args.workers is None else args.workers
         return main_legacy(
             input_dir=input_dir,
             output_dir=output_dir,
             target_size=DCI_4K_RESOLUTION,
+            workers=workers or None,
         )
 
     return run_yaml_pipeline(manifest_path, input_dir, output_dir)
@@ -410,6 +447,7 @@ def main_legacy(
     input_dir: Path | str | None = None,
     output_dir: Path | str | None = None,
     target_size: Tuple[int, int] = DCI_4K_RESOLUTION,
+    workers: Optional[int] = 1,
 ):
     """
     Legacy main pipeline execution.
@@ -437,6 +475,7 @@ def main_legacy(
         input_dir=resolved_input,
         output_dir=resolved_output,
         target_size=target_size,
+        workers=workers,
     )
 
     processed_count = len(results["processed"])
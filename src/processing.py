@@ -286,7 +286,8 @@ def process_image(
         output_path (str): Path for the output image
         target_size (tuple): Target size for resizing
         crop_box (tuple, optional): Manual crop box (left, top, right, bottom)
-        grading (dict, optional): Grading parameters for color adjustments
+        grading (dict or GradingPlan, optional): Grading parameters for color
+            adjustments
         variant (dict, optional): Additional directives for this render variant.
             Supported keys include:
             ``"crop"`` (preset name or ``{"preset": name, "offset": (x, y)}``),
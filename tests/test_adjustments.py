@@ -4,14 +4,16 @@ from pathlib import Path
 import sys
 
 import numpy as np
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageEnhance
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.adjustments import (
+    GradingPlan,
     apply_grading,
+    apply_highlight_lift,
     apply_local_contrast,
     apply_shadow_lift,
     apply_temperature_shift,
@@ -90,6 +92,86 @@ def test_apply_grading_runs_in_order():
     assert graded_mean.mean() >= base_mean.mean()
 
 
+def test_apply_grading_tone_stages_match_chained_primitives():
+    rng = np.random.default_rng(7)
+    base = Image.fromarray(rng.integers(0, 256, (16, 16, 4), dtype=np.uint8), mode="RGBA")
+
+    graded = apply_grading(
+        base,
+        {"temperature_shift": -12.5, "shadow_lift": 0.3, "highlight_lift": 0.25},
+    )
+    chained = apply_highlight_lift(
+        apply_shadow_lift(apply_temperature_shift(base, -12.5), 0.3), 0.25
+    )
+
+    assert graded.mode == "RGBA"
+    assert graded.tobytes() == chained.tobytes()
+
+
+def test_apply_grading_folds_exposure_into_tone_curves():
+    rng = np.random.default_rng(11)
+    base = Image.fromarray(rng.integers(0, 256, (16, 16, 3), dtype=np.uint8), mode="RGB")
+
+    graded = apply_grading(base, {"exposure": 0.2, "temperature_shift": 6.0, "shadow_lift": 0.15})
+    chained = apply_shadow_lift(
+        apply_temperature_shift(ImageEnhance.Brightness(base).enhance(1.2), 6.0), 0.15
+    )
+
+    assert graded.tobytes() == chained.tobytes()
+
+
+def test_apply_grading_preserves_la_alpha():
+    rng = np.random.default_rng(5)
+    base = Image.fromarray(rng.integers(0, 256, (8, 8, 2), dtype=np.uint8), mode="LA")
+
+    graded = apply_grading(
+        base, {"exposure": 0.1, "contrast": 0.3, "saturation": 1.2, "micro_contrast": 1.3}
+    )
+
+    assert graded.mode == "LA"
+    assert graded.getchannel("A").tobytes() == base.getchannel("A").tobytes()
+
+    toned = apply_grading(base, {"exposure": 0.1, "contrast": 0.3})
+    expected = ImageEnhance.Contrast(ImageEnhance.Brightness(base).enhance(1.1)).enhance(1.3)
+    assert toned.tobytes() == expected.tobytes()
+
+
+def test_apply_grading_enhances_cmyk_in_place():
+    rng = np.random.default_rng(6)
+    base = Image.fromarray(rng.integers(0, 256, (8, 8, 4), dtype=np.uint8), mode="CMYK")
+
+    graded = apply_grading(base, {"exposure": 0.15, "contrast": 0.3, "saturation": 1.4})
+
+    expected = ImageEnhance.Brightness(base).enhance(1.15)
+    expected = ImageEnhance.Contrast(expected).enhance(1.3)
+    expected = ImageEnhance.Color(expected).enhance(1.4)
+    assert graded.mode == "CMYK"
+    assert graded.tobytes() == expected.tobytes()
+
+
+def test_grading_plan_resolves_manifest_conventions():
+    plan = GradingPlan.from_mapping(
+        {"exposure": 0.1, "contrast": 0.2, "saturation": 1.5, "shadow_lift": 0, "local_contrast": 1.1}
+    )
+
+    assert plan.exposure_factor == 1.1
+    assert plan.contrast_factor == 1.2
+    assert plan.saturation_factor == 1.5
+    assert plan.shadow_lift is None
+    assert plan.micro_contrast == 1.1
+    assert not GradingPlan.from_mapping({})
+
+
+def test_apply_grading_accepts_resolved_plan():
+    rng = np.random.default_rng(3)
+    base = Image.fromarray(rng.integers(0, 256, (16, 16, 3), dtype=np.uint8), mode="RGB")
+    grading = {"exposure": -0.1, "saturation": 0.3, "temperature_shift": 4.0, "highlight_lift": 0.2}
+
+    from_plan = apply_grading(base, GradingPlan.from_mapping(grading))
+
+    assert from_plan.tobytes() == apply_grading(base, grading).tobytes()
+
+
 def test_inpaint_with_mask_softens_marked_region():
     background_color = (120, 130, 140)
     image = Image.new("RGB", (80, 80), color=background_color)
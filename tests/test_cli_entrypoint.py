@@ -3,6 +3,8 @@
 from pathlib import Path
 import sys
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
@@ -45,8 +47,9 @@ def test_main_legacy_flag_invokes_legacy(monkeypatch):
         run_called = True
         return 0
 
-    def fake_legacy(*, input_dir, output_dir, target_size):
+    def fake_legacy(*, input_dir, output_dir, target_size, workers):
         captured["args"] = (input_dir, output_dir, target_size)
+        captured["workers"] = workers
         return 5
 
     monkeypatch.setattr(cli, "run_yaml_pipeline", fake_run_yaml)
@@ -61,6 +64,7 @@ def test_main_legacy_flag_invokes_legacy(monkeypatch):
     assert input_dir == Path("custom/in")
     assert output_dir == Path("custom/out")
     assert target_size == cli.DCI_4K_RESOLUTION
+    assert captured["workers"] == 1
 
 
 def test_main_accepts_positional_input_override(monkeypatch, tmp_path):
@@ -96,8 +100,9 @@ def test_main_accepts_positional_input_and_output_for_legacy(monkeypatch, tmp_pa
     def fake_run_yaml(*_args, **_kwargs):  # pragma: no cover - skip YAML path
         raise AssertionError("YAML pipeline should not run when --legacy is provided")
 
-    def fake_legacy(*, input_dir, output_dir, target_size):
+    def fake_legacy(*, input_dir, output_dir, target_size, workers):
         captured["args"] = (input_dir, output_dir, target_size)
+        captured["workers"] = workers
         return 0
 
     monkeypatch.setattr(cli, "run_yaml_pipeline", fake_run_yaml)
@@ -117,3 +122,48 @@ def test_main_accepts_positional_input_and_output_for_legacy(monkeypatch, tmp_pa
     assert input_dir == custom_input
     assert output_dir == custom_output
     assert target_size == cli.DCI_4K_RESOLUTION
+    assert captured["workers"] == 1
+
+
+def test_main_forwards_workers_to_legacy(monkeypatch):
+    """--workers reaches the legacy pipeline; 0 means every CPU (None)."""
+
+    captured = []
+
+    def fake_legacy(*, input_dir, output_dir, target_size, workers):
+        captured.append(workers)
+        return 0
+
+    monkeypatch.setattr(cli, "main_legacy", fake_legacy)
+
+    assert cli.main(["--legacy", "--workers", "3"]) == 0
+    assert cli.main(["--legacy", "--workers", "0"]) == 0
+    assert captured == [3, None]
+
+
+def test_main_rejects_negative_workers(monkeypatch):
+    """Negative worker counts are a usage error."""
+
+    def fail_legacy(**_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("Legacy path should not run with invalid --workers")
+
+    monkeypatch.setattr(cli, "main_legacy", fail_legacy)
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["--legacy", "--workers", "-1"])
+
+    assert excinfo.value.code == 2
+
+
+def test_main_rejects_workers_without_legacy(monkeypatch):
+    """--workers only applies to the legacy pipeline."""
+
+    def fail_yaml(*_args, **_kwargs):  # pragma: no cover - should not run
+        raise AssertionError("YAML path should not run with --workers")
+
+    monkeypatch.setattr(cli, "run_yaml_pipeline", fail_yaml)
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["--workers", "8"])
+
+    assert excinfo.value.code == 2
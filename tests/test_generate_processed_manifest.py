@@ -0,0 +1,160 @@
+"""Tests for the processed-output pairing script."""
+
+from pathlib import Path
+import csv
+import importlib.util
+import os
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = PROJECT_ROOT / "scripts" / "generate_processed_manifest.py"
+
+_spec = importlib.util.spec_from_file_location("generate_processed_manifest", SCRIPT_PATH)
+gpm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gpm)
+
+
+def test_norm_stem_strips_noise_tokens():
+    assert gpm.norm_stem("lobby_daylight_processed.jpg") == "lobby_daylight"
+    assert gpm.norm_stem("Pool-Dusk_v3.png") == "pool_dusk"
+    assert gpm.norm_stem("terrace_final.tif") == "terrace"
+    assert gpm.norm_stem("kitchen_16bit.exr") == "kitchen"
+    assert gpm.norm_stem("atrium_4096x2160.png") == "atrium"
+
+
+def test_norm_stem_keeps_tokens_embedded_in_words():
+    assert gpm.norm_stem("finale_view.png") == "finale_view"
+    assert gpm.norm_stem("drafting_room.jpg") == "drafting_room"
+
+
+def _record(name: str, size: int) -> dict:
+    return {
+        "filename": name,
+        "bytes": size,
+        "ext": Path(name).suffix.lower(),
+        "norm_stem": gpm.norm_stem(name),
+    }
+
+
+def test_choose_best_match_prefers_processed_counterpart():
+    main = _record("pool_dusk_processed.jpg", 1000)
+    candidates = [_record("terrace.jpg", 1000), _record("pool_dusk.jpg", 1020)]
+
+    match, metrics = gpm.choose_best_match(main, candidates)
+
+    assert match is candidates[1]
+    assert metrics["name_sim"] == 1.0
+    assert gpm.classify_status(main, match, metrics) == "MATCH_STRONG"
+
+
+def test_choose_best_match_rejects_dissimilar_names():
+    main = _record("pool_dusk_processed.jpg", 1000)
+
+    match, metrics = gpm.choose_best_match(main, [_record("terrace.jpg", 1000)])
+
+    assert match is None
+    assert gpm.classify_status(main, match, metrics) == "ORPHAN_MAIN"
+
+
+def test_choose_best_match_scores_main_stem_first():
+    # ratio() is asymmetric here: 0.615 as (main, enhance), 0.769 if swapped.
+    main = _record("dining_master_processed.jpg", 1000)
+
+    match, metrics = gpm.choose_best_match(main, [_record("dining_atrium.jpg", 1000)])
+
+    assert match is None
+    assert gpm.classify_status(main, match, metrics) == "ORPHAN_MAIN"
+
+    main = _record("dining_atrium_processed.jpg", 1000)
+
+    match, metrics = gpm.choose_best_match(main, [_record("dining_master.jpg", 1000)])
+
+    assert round(metrics["name_sim"], 3) == 0.769
+    assert gpm.classify_status(main, match, metrics) == "MATCH_WEAK"
+
+
+def test_readable_size_scales_units():
+    assert gpm.readable_size(512) == "512 B"
+    assert gpm.readable_size(1030) == "1.0 KB"
+    assert gpm.readable_size(5 * 1024 * 1024) == "5.0 MB"
+    assert gpm.readable_size(3 * 1024**4) == "3.0 TB"
+
+
+def _write(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+def _run_main(tmp_path, monkeypatch) -> list:
+    monkeypatch.setattr(gpm, "REPO", tmp_path)
+    monkeypatch.setattr(gpm, "MAIN_DIR", tmp_path / "results" / "new_output")
+    monkeypatch.setattr(gpm, "ENH_DIR", tmp_path / "output")
+    monkeypatch.setattr(gpm, "OUT_DIR", tmp_path / "manifests")
+
+    assert gpm.main() == 0
+
+    with (tmp_path / "manifests" / "pairs.csv").open(newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def test_fuzzy_fallback_matches_short_stems_with_typos(tmp_path, monkeypatch):
+    # One typo in a short stem shares no trigram with its counterpart but still
+    # scores 0.75, above SIM_THRESHOLD.
+    _write(tmp_path / "results" / "new_output" / "deyk_processed.png", 100)
+    _write(tmp_path / "results" / "new_output" / "eest_processed.png", 100)
+    _write(tmp_path / "output" / "deck.png", 100)
+    _write(tmp_path / "output" / "east.png", 100)
+    _write(tmp_path / "output" / "west_v2.exr", 1000)
+
+    pairs = {row["main_file"]: row for row in _run_main(tmp_path, monkeypatch)}
+
+    assert pairs["deyk_processed.png"]["enh_file"] == "deck.png"
+    assert pairs["deyk_processed.png"]["name_similarity"] == "0.750"
+    assert pairs["deyk_processed.png"]["status"] == "MATCH_WEAK"
+    assert pairs["eest_processed.png"]["enh_file"] == "east.png"
+
+
+def test_fuzzy_fallback_leaves_unrelated_stems_orphaned(tmp_path, monkeypatch):
+    _write(tmp_path / "results" / "new_output" / "lobby_processed.png", 100)
+    _write(tmp_path / "output" / "terrace.png", 100)
+
+    (row,) = _run_main(tmp_path, monkeypatch)
+
+    assert row["status"] == "ORPHAN_MAIN"
+    assert row["enh_file"] == ""
+
+
+def test_list_files_follows_rglob_order(tmp_path):
+    for name in ("c", "a", "b"):
+        _write(tmp_path / name / "pool_dusk.png", 10)
+    _write(tmp_path / "top.png", 10)
+
+    listed = [entry.path for entry in gpm.list_files(tmp_path)]
+
+    assert listed == [str(path) for path in tmp_path.rglob("*") if path.is_file()]
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="root ignores directory permission bits",
+)
+def test_list_files_skips_unreadable_directories(tmp_path):
+    _write(tmp_path / "open" / "pool_dusk.png", 10)
+    locked = tmp_path / "locked"
+    _write(locked / "lobby.png", 10)
+    locked.chmod(0)
+    try:
+        listed = [entry.path for entry in gpm.list_files(tmp_path)]
+    finally:
+        locked.chmod(0o755)
+
+    assert listed == [str(tmp_path / "open" / "pool_dusk.png")]
+
+
+def test_write_csv_single_field(tmp_path):
+    path = tmp_path / "single.csv"
+    gpm.write_csv(path, [{"a": "hello"}, {}], ["a"])
+
+    with path.open(newline="") as f:
+        assert list(csv.reader(f)) == [["a"], ["hello"], [""]]
@@ -60,3 +60,28 @@ def test_pipeline_applies_crop_and_grading(tmp_path):
     assert mean_channels[0] > mean_channels[2]
     # Shadow lift combined with resizing should raise overall brightness
     assert mean_channels.mean() > base[:, 20:, :].mean()
+
+
+def test_pipeline_workers_preserve_job_order(tmp_path):
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+
+    for index, name in enumerate(("a.png", "b.png", "c.png")):
+        Image.new("RGB", (16, 8), color=(40 * index, 80, 120)).save(input_dir / name)
+
+    serial = run_pipeline(input_dir=input_dir, output_dir=output_dir, target_size=(16, 8))
+    parallel = run_pipeline(
+        input_dir=input_dir,
+        output_dir=output_dir,
+        target_size=(16, 8),
+        workers=2,
+    )
+
+    assert parallel["processed"] == serial["processed"]
+    assert [Path(path).name for path in parallel["processed"]] == [
+        "a_processed.png",
+        "b_processed.png",
+        "c_processed.png",
+    ]
+    assert parallel["failed"] == []
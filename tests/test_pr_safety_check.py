@@ -0,0 +1,97 @@
+"""Tests for the PR deletion safety check script."""
+
+from pathlib import Path
+import importlib.util
+import os
+import time
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = PROJECT_ROOT / "scripts" / "pr_safety_check.py"
+
+_spec = importlib.util.spec_from_file_location("pr_safety_check", SCRIPT_PATH)
+psc = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(psc)
+
+
+def _stub_checks(monkeypatch, *, git_refs=None, tests_pass=True):
+    ran = []
+
+    def fake_run_tests():
+        ran.append(True)
+        return tests_pass
+
+    monkeypatch.setattr(psc, "find_pr_references", lambda root, prs: {pr: [] for pr in prs})
+    monkeypatch.setattr(
+        psc, "check_git_history", lambda prs: {pr: list((git_refs or {}).get(pr, [])) for pr in prs}
+    )
+    monkeypatch.setattr(psc, "run_tests", fake_run_tests)
+    return ran
+
+
+def test_report_without_tests_never_declares_safe(monkeypatch):
+    ran = _stub_checks(monkeypatch)
+
+    report = psc.generate_safety_report([6, 7])
+
+    assert not ran
+    assert "SAFE TO DELETE" not in report
+    assert "NO REFERENCES FOUND: Tests not run" in report
+    assert "Re-run with --run-tests" in report
+
+
+def test_report_with_passing_tests_declares_safe(monkeypatch):
+    ran = _stub_checks(monkeypatch)
+
+    report = psc.generate_safety_report([6, 7], include_tests=True)
+
+    assert ran
+    assert "SAFE TO DELETE: No dependencies found" in report
+
+
+def test_failing_tests_add_risk_only_when_run(monkeypatch):
+    _stub_checks(monkeypatch, tests_pass=False)
+
+    report = psc.generate_safety_report([6], include_tests=True)
+    assert "MEDIUM RISK: Tests failing" in report
+    assert "EXERCISE CAUTION" in report
+
+    # Git references (2) plus failing tests (2) push the score past caution.
+    _stub_checks(monkeypatch, git_refs={6: ["abc123 Merge #6"]}, tests_pass=False)
+    report = psc.generate_safety_report([6], include_tests=True)
+    assert "NOT SAFE TO DELETE" in report
+
+    # Skipped tests add nothing: git references alone stay at caution.
+    report = psc.generate_safety_report([6])
+    assert "MEDIUM RISK: Tests failing" not in report
+    assert "EXERCISE CAUTION" in report
+
+
+def _fake_git(tmp_path, monkeypatch, body):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    git = bin_dir / "git"
+    git.write_text("#!/bin/sh\n" + body)
+    git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fake git is a shell script")
+def test_check_git_history_reads_git_log(tmp_path, monkeypatch):
+    _fake_git(tmp_path, monkeypatch, "echo 'abc123 Merge pull request #6'\necho 'def456 Tidy'\n")
+
+    assert psc.check_git_history([6, 7]) == {6: ["abc123 Merge pull request #6"], 7: []}
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fake git is a shell script")
+def test_check_git_history_kills_git_at_deadline(tmp_path, monkeypatch):
+    _fake_git(tmp_path, monkeypatch, "echo 'abc123 Merge pull request #6'\nsleep 30\n")
+    monkeypatch.setattr(psc, "GIT_LOG_TIMEOUT", 0.2)
+
+    start = time.monotonic()
+    references = psc.check_git_history([6])
+
+    assert time.monotonic() - start < 10
+    # A killed run is incomplete, so its partial matches are discarded.
+    assert references == {6: []}
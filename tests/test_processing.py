@@ -78,6 +78,14 @@ def test_apply_crop_preset_resolves_mapping():
     assert (preset_image.width / preset_image.height) == pytest.approx(16 / 9, rel=1e-3)
 
 
+def test_apply_crop_preset_skips_crop_at_native_ratio():
+    """Images already at the preset ratio are returned without a crop."""
+
+    base = Image.new("RGB", (1600, 900), color=(100, 100, 100))
+
+    assert apply_crop_preset(base, "web_16x9") is base
+
+
 def _sampled_test_image() -> Image.Image:
     """Create a small image with varied tones for grading assertions."""
 
@@ -117,6 +125,17 @@ def test_apply_grading_saturation_supports_additive_and_multiplier():
     assert multiplier.tobytes() == expected_multiplier.tobytes()
 
 
+def test_apply_grading_exposure_and_contrast_match_enhancers():
+    """Exposure followed by contrast matches the chained Pillow enhancers."""
+
+    base = _sampled_test_image()
+
+    graded = apply_grading(base, {"exposure": 0.15, "contrast": 1.3})
+    brightened = ImageEnhance.Brightness(base).enhance(1.15)
+    expected = ImageEnhance.Contrast(brightened).enhance(1.3)
+    assert graded.tobytes() == expected.tobytes()
+
+
 def test_process_image_honors_variant_crop(tmp_path):
     """Crops are performed before resizing so padding only happens afterward."""
 